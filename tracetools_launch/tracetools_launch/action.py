@@ -16,6 +16,7 @@
 """Module for the Trace action."""
 
 import fnmatch
+import functools
 import re
 import shlex
 from typing import Dict
@@ -23,6 +24,7 @@ from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Text
+from typing import Tuple
 from typing import Union
 
 from launch import logging
@@ -34,6 +36,7 @@ from launch.frontend import expose_action
 from launch.frontend import Parser
 from launch.launch_context import LaunchContext
 from launch.some_substitutions_type import SomeSubstitutionsType
+from launch.substitution import Substitution
 from launch.substitutions import TextSubstitution
 from launch.utilities import normalize_to_list_of_substitutions
 from launch.utilities import perform_substitutions
@@ -44,6 +47,40 @@ from tracetools_trace.tools import path
 from .actions.ld_preload import LdPreload
 
 
+def _normalize_unless_text(
+    value: SomeSubstitutionsType,
+) -> Union[Text, List[Substitution]]:
+    """Normalize to a list of substitutions, unless the value is already plain text."""
+    return value if isinstance(value, str) else normalize_to_list_of_substitutions(value)
+
+
+def _perform_substitutions_unless_text(
+    context: LaunchContext,
+    value: Union[Text, List[Substitution]],
+) -> Text:
+    """Perform substitutions, unless the value is already plain text."""
+    return value if isinstance(value, str) else perform_substitutions(context, value)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_substitution(
+    parser: Parser,
+    value: Text,
+) -> Tuple[Substitution, ...]:
+    """
+    Parse a substitution string.
+
+    The result is cached, since the same strings (e.g., lists of events) often get parsed for
+    multiple Trace actions. Substitutions are only evaluated later, so this is independent of
+    the launch context.
+
+    :param parser: the frontend parser
+    :param value: the string to parse
+    :return: the parsed substitutions
+    """
+    return tuple(parser.parse_substitution(value))
+
+
 @expose_action('trace')
 class Trace(Action):
     """
@@ -153,8 +190,11 @@ class Trace(Action):
         self.__base_path = base_path \
             if base_path is None else normalize_to_list_of_substitutions(base_path)
         self.__trace_directory = None
-        self.__events_ust = [normalize_to_list_of_substitutions(x) for x in events_ust]
-        self.__events_kernel = [normalize_to_list_of_substitutions(x) for x in events_kernel]
+        # Plain strings (e.g., the default events) do not need to be normalized
+        # The events become plain strings once substitutions are performed
+        self.__events_ust: Union[List[Union[Text, List[Substitution]]], List[str]] = \
+            [_normalize_unless_text(x) for x in events_ust]
+        self.__events_kernel = [_normalize_unless_text(x) for x in events_kernel]
         # Use value from deprecated param if it is provided
         # TODO(christophebedard) remove context_names param in Rolling after Humble release
         if context_names is not None:
@@ -162,12 +202,17 @@ class Trace(Action):
             self.__logger.warning('context_names parameter is deprecated, use context_fields')
         self.__context_fields = \
             {
-                domain: [normalize_to_list_of_substitutions(field) for field in fields]
+                domain: [_normalize_unless_text(field) for field in fields]
                 for domain, fields in context_fields.items()
             } \
             if isinstance(context_fields, dict) \
-            else [normalize_to_list_of_substitutions(field) for field in context_fields]
+            else [_normalize_unless_text(field) for field in context_fields]
         self.__ld_preload_actions: List[LdPreload] = []
+        # If the UST events are plain strings, the libs to preload are already known
+        events_ust_text = [x for x in self.__events_ust if isinstance(x, str)]
+        self.__ld_preload_libs: Optional[List[str]] = \
+            self.__get_ld_preload_libs(events_ust_text) \
+            if len(events_ust_text) == len(self.__events_ust) else None
 
     @property
     def session_name(self):
@@ -214,47 +259,44 @@ class Trace(Action):
         """
         result_args = []
         arg: List[SomeSubstitutionsType] = []
-
-        def _append_arg():
-            nonlocal arg
-            result_args.append(arg)
-            arg = []
-        for sub in parser.parse_substitution(cmd):
-            if isinstance(sub, TextSubstitution):
-                tokens = shlex.split(sub.text)
-                if not tokens:
-                    # Sting with just spaces.
-                    # Appending args allow splitting two substitutions
-                    # separated by a space.
-                    # e.g.: `$(subst1 asd) $(subst2 bsd)` will be two separate arguments.
-                    _append_arg()
-                    continue
-                if sub.text[0].isspace():
-                    # Needed for splitting from the previous argument
-                    # e.g.: `$(find-exec bsd) asd`
-                    # It splits `asd` from the path of `bsd` executable.
-                    if len(arg) != 0:
-                        _append_arg()
-                arg.append(TextSubstitution(text=tokens[0]))
-                if len(tokens) > 1:
-                    # Needed to split the first argument when more than one token.
-                    # e.g. `$(find-pkg-prefix csd)/asd bsd`
-                    # will split `$(find-pkg-prefix csd)/asd` from `bsd`.
-                    _append_arg()
-                    arg.append(TextSubstitution(text=tokens[-1]))
-                if len(tokens) > 2:
-                    # If there are more than two tokens, just add all the middle tokens to
-                    # `result_args`.
-                    # e.g. `$(find-pkg-prefix csd)/asd bsd dsd xsd`
-                    # 'bsd' 'dsd' will be added.
-                    result_args.extend([TextSubstitution(text=x)] for x in tokens[1:-1])
-                if sub.text[-1].isspace():
-                    # Allows splitting from next argument.
-                    # e.g. `exec $(find-some-file)`
-                    # Will split `exec` argument from the result of `find-some-file` substitution.
-                    _append_arg()
-            else:
+        for sub in _parse_substitution(parser, cmd):
+            if not isinstance(sub, TextSubstitution):
                 arg.append(sub)
+                continue
+            text = sub.text
+            tokens = shlex.split(text)
+            if not tokens:
+                # Sting with just spaces.
+                # Appending args allow splitting two substitutions
+                # separated by a space.
+                # e.g.: `$(subst1 asd) $(subst2 bsd)` will be two separate arguments.
+                result_args.append(arg)
+                arg = []
+                continue
+            if arg and text[0].isspace():
+                # Needed for splitting from the previous argument
+                # e.g.: `$(find-exec bsd) asd`
+                # It splits `asd` from the path of `bsd` executable.
+                result_args.append(arg)
+                arg = []
+            arg.append(TextSubstitution(text=tokens[0]))
+            if len(tokens) > 1:
+                # Needed to split the first argument when more than one token.
+                # e.g. `$(find-pkg-prefix csd)/asd bsd`
+                # will split `$(find-pkg-prefix csd)/asd` from `bsd`.
+                # If there are more than two tokens, just add all the middle tokens to
+                # `result_args`.
+                # e.g. `$(find-pkg-prefix csd)/asd bsd dsd xsd`
+                # 'bsd' 'dsd' will be added.
+                result_args.append(arg)
+                result_args.extend([TextSubstitution(text=x)] for x in tokens[1:-1])
+                arg = [TextSubstitution(text=tokens[-1])]
+            if text[-1].isspace():
+                # Allows splitting from next argument.
+                # e.g. `exec $(find-some-file)`
+                # Will split `exec` argument from the result of `find-some-file` substitution.
+                result_args.append(arg)
+                arg = []
         if arg:
             result_args.append(arg)
         return result_args
@@ -307,12 +349,13 @@ class Trace(Action):
         :param events: the list of event names against which to check for match
         :return: `True` if any of the event patterns matches any of the events, `False` otherwise
         """
-        # Translate UNIX-style event patterns into regexes
-        event_pattern_regexes = [fnmatch.translate(pattern) for pattern in event_patterns]
-        return any(
-            any(re.match(event_pattern_regex, event_name) for event_name in events)
-            for event_pattern_regex in event_pattern_regexes
-        )
+        if not event_patterns:
+            return False
+        # Translate UNIX-style event patterns into a single regex that matches any of them,
+        # so that the events are only scanned once
+        event_patterns_regex = re.compile(
+            '|'.join(fnmatch.translate(pattern) for pattern in event_patterns))
+        return any(map(event_patterns_regex.match, events))
 
     @classmethod
     def has_libc_wrapper_events(
@@ -355,34 +398,47 @@ class Trace(Action):
             self.__session_name = path.append_timestamp(self.__session_name)
         self.__base_path = perform_substitutions(context, self.__base_path) \
             if self.__base_path else path.get_tracing_directory()
-        self.__events_ust = [perform_substitutions(context, x) for x in self.__events_ust]
-        self.__events_kernel = [perform_substitutions(context, x) for x in self.__events_kernel]
+        events_ust: List[str] = [
+            _perform_substitutions_unless_text(context, x) for x in self.__events_ust]
+        self.__events_ust = events_ust
+        self.__events_kernel = [
+            _perform_substitutions_unless_text(context, x) for x in self.__events_kernel]
         self.__context_fields = \
             {
-                domain: [perform_substitutions(context, field) for field in fields]
+                domain: [_perform_substitutions_unless_text(context, field) for field in fields]
                 for domain, fields in self.__context_fields.items()
             } \
             if isinstance(self.__context_fields, dict) \
-            else [perform_substitutions(context, field) for field in self.__context_fields]
+            else [
+                _perform_substitutions_unless_text(context, field)
+                for field in self.__context_fields
+            ]
 
         # Add LD_PRELOAD actions if corresponding events are enabled
-        if self.has_libc_wrapper_events(self.__events_ust):
-            self.__ld_preload_actions.append(LdPreload(self.LIB_LIBC_WRAPPER))
-        if self.has_pthread_wrapper_events(self.__events_ust):
-            self.__ld_preload_actions.append(LdPreload(self.LIB_PTHREAD_WRAPPER))
-        if self.has_dl_events(self.__events_ust):
-            self.__ld_preload_actions.append(LdPreload(self.LIB_DL))
+        if self.__ld_preload_libs is None:
+            self.__ld_preload_libs = self.__get_ld_preload_libs(events_ust)
+        self.__ld_preload_actions.extend(LdPreload(lib) for lib in self.__ld_preload_libs)
         # Warn if events match both normal AND fast profiling libs
-        has_fast_profiling_events = self.has_profiling_events(self.__events_ust, True)
-        has_normal_profiling_events = self.has_profiling_events(self.__events_ust, False)
-        # In practice, the first lib in the LD_PRELOAD list will be used, so the fast one here
-        if has_fast_profiling_events:
-            self.__ld_preload_actions.append(LdPreload(self.LIB_PROFILE_FAST))
-        if has_normal_profiling_events:
-            self.__ld_preload_actions.append(LdPreload(self.LIB_PROFILE_NORMAL))
-        if has_normal_profiling_events and has_fast_profiling_events:
+        profiling_libs = {self.LIB_PROFILE_FAST, self.LIB_PROFILE_NORMAL}
+        if profiling_libs.issubset(self.__ld_preload_libs):
             self.__logger.warning('events match both normal and fast profiling shared libraries')
 
+    def __get_ld_preload_libs(self, events_ust: List[str]) -> List[str]:
+        """Get the shared libraries to LD_PRELOAD for the given UST events."""
+        libs = []
+        if self.has_libc_wrapper_events(events_ust):
+            libs.append(self.LIB_LIBC_WRAPPER)
+        if self.has_pthread_wrapper_events(events_ust):
+            libs.append(self.LIB_PTHREAD_WRAPPER)
+        if self.has_dl_events(events_ust):
+            libs.append(self.LIB_DL)
+        # In practice, the first lib in the LD_PRELOAD list will be used, so the fast one here
+        if self.has_profiling_events(events_ust, True):
+            libs.append(self.LIB_PROFILE_FAST)
+        if self.has_profiling_events(events_ust, False):
+            libs.append(self.LIB_PROFILE_NORMAL)
+        return libs
+
     def execute(self, context: LaunchContext) -> Optional[List[Action]]:
         self.__perform_substitutions(context)
         # TODO make sure this is done as early as possible
@@ -17,6 +17,7 @@
 import os
 from typing import Iterable
 from typing import List
+from typing import Optional
 
 import babeltrace
 
@@ -51,16 +52,26 @@ def get_trace_ctf_events(trace_directory: str) -> Iterable[babeltrace.babeltrace
     return tc.events
 
 
-def get_trace_events(trace_directory: str) -> List[DictEvent]:
+def get_trace_events(
+    trace_directory: str,
+    event_names: Optional[Iterable[str]] = None,
+) -> List[DictEvent]:
     """
     Get the events of a trace.
 
+    Events can be filtered by name, in which case other events are dropped before being converted.
+    Since they are not converted, discarded events are not reported for the dropped events.
+
     :param trace_directory: the path to the main/top trace directory
+    :param event_names: the exact names of the events to get, not patterns
+        (or `None` to get all events)
     :return: events
     """
-    events: List[DictEvent] = [
-        event_to_dict(event) for event in get_trace_ctf_events(trace_directory)
-    ]
+    ctf_events = get_trace_ctf_events(trace_directory)
+    if event_names is not None:
+        event_names_set = set(event_names)
+        ctf_events = (event for event in ctf_events if event.name in event_names_set)
+    events: List[DictEvent] = [event_to_dict(event) for event in ctf_events]
     return events
 
 
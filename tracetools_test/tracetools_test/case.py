@@ -15,9 +15,12 @@
 
 """Module for a tracing-specific unittest.TestCase extension."""
 
+from collections import defaultdict
+import operator
 import os
 import time
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Type
@@ -33,7 +36,6 @@ from tracetools_read import get_procname
 from tracetools_read.trace import get_trace_events
 
 from .utils import cleanup_trace
-from .utils import get_event_names
 from .utils import run_and_trace
 
 
@@ -75,8 +77,12 @@ class TraceTestCase(unittest.TestCase):
         self._additional_actions = additional_actions
 
     def setUp(self):
-        # Get timestamp before trace (ns)
-        timestamp_before = int(time.time() * 1000000000.0)
+        # Fail before launching anything if there is nothing to trace
+        self.assertTrue(
+            self._events_ros or self._events_kernel, 'no events enabled, nothing was traced')
+
+        # Get timestamp before trace (ns, like the trace timestamps)
+        timestamp_before = time.time_ns()
 
         exit_code, full_path = run_and_trace(
             self._base_path,
@@ -88,18 +94,27 @@ class TraceTestCase(unittest.TestCase):
             self._additional_actions,
         )
 
-        print(f'TRACE DIRECTORY: {full_path}')
         self._exit_code = exit_code
         self._full_path = full_path
+        print(f'TRACE DIRECTORY: {full_path}')
 
         # Check that setUp() ran fine
         self.assertEqual(self._exit_code, 0)
 
         # Read events once
         self._events = get_trace_events(self._full_path)
-        self._event_names = get_event_names(self._events)
         self.assertGreater(len(self._events), 0, 'no events found in trace')
 
+        # Index events by name and by procname to avoid scanning all events for every lookup
+        events_by_name: Dict[str, List[DictEvent]] = defaultdict(list)
+        events_by_procname: Dict[str, List[DictEvent]] = defaultdict(list)
+        for event in self._events:
+            events_by_name[get_event_name(event)].append(event)
+            events_by_procname[get_procname(event)].append(event)
+        # Use plain dicts so that lookups for missing keys do not add them
+        self._events_by_name = dict(events_by_name)
+        self._events_by_procname = dict(events_by_procname)
+
         # Check the timestamp of the first event
         self.assertEventAfterTimestamp(self._events[0], timestamp_before)
 
@@ -107,7 +122,7 @@ class TraceTestCase(unittest.TestCase):
         ros = set(self._events_ros) if self._events_ros is not None else set()
         kernel = set(self._events_kernel) if self._events_kernel is not None else set()
         all_event_names = ros | kernel
-        self.assertSetEqual(all_event_names, set(self._event_names))
+        self.assertSetEqual(all_event_names, set(self._events_by_name))
 
         # Check that the launched nodes are present as processes
         self.assertProcessNamesExist(self._nodes)
@@ -115,6 +130,10 @@ class TraceTestCase(unittest.TestCase):
     def tearDown(self):
         if not os.environ.get(self.ENV_VAR_DEBUG, None):
             cleanup_trace(self._full_path)
+        # Release the events, since the test case object can outlive the test
+        del self._events
+        del self._events_by_name
+        del self._events_by_procname
 
     def assertEventsSet(  # noqa: N802
         self,
@@ -125,7 +144,7 @@ class TraceTestCase(unittest.TestCase):
 
         :param event_names: the list of event names to compare to (as a set)
         """
-        self.assertSetEqual(set(self._event_names), set(event_names), 'wrong events')
+        self.assertSetEqual(set(self._events_by_name), set(event_names), 'wrong events')
 
     def assertProcessNamesExist(  # noqa: N802
         self,
@@ -136,11 +155,10 @@ class TraceTestCase(unittest.TestCase):
 
         :param names: the node names to look for
         """
-        procnames = [get_procname(e) for e in self._events]
+        procnames = set(self._events_by_procname)
         for name in names:
             # Procnames have a max length of 15
-            name_trimmed = name[:15]
-            self.assertTrue(name_trimmed in procnames, 'node name not found in tracepoints')
+            self.assertIn(name[:15], procnames, 'node name not found in tracepoints')
 
     def assertFieldType(  # noqa: N802
         self,
@@ -159,11 +177,11 @@ class TraceTestCase(unittest.TestCase):
             field_names = [field_names]
         for field_name in field_names:
             field_value = self.get_field(event, field_name)
-            self.assertIsInstance(
-                field_value,
-                field_type,
-                f'expected {field_name} field type {field_type.__name__}, '
-                f'got {type(field_value).__name__}')
+            # Only format the message on failure
+            if not isinstance(field_value, field_type):
+                self.fail(
+                    f'expected {field_name} field type {field_type.__name__}, '
+                    f'got {type(field_value).__name__}')
 
     def assertValidHandle(  # noqa: N802
         self,
@@ -218,15 +236,11 @@ class TraceTestCase(unittest.TestCase):
             array_field_names = [array_field_names]
         for field_name in array_field_names:
             array_value = self.get_field(event, field_name)
-            self.assertIsInstance(
-                array_value,
-                list,
-                f'{field_name} value not array: {array_value}')
-            if array_type and len(array_value) > 0:
-                self.assertIsInstance(
-                    array_value[0],
-                    array_type,
-                    f'{field_name} array element not {array_type.__name__}: {array_value}')
+            # Only format the messages (which include the whole array) on failure
+            if not isinstance(array_value, list):
+                self.fail(f'{field_name} value not array: {array_value}')
+            if array_type and len(array_value) > 0 and not isinstance(array_value[0], array_type):
+                self.fail(f'{field_name} array element not {array_type.__name__}: {array_value}')
 
     def assertValidQueueDepth(  # noqa: N802
         self,
@@ -328,10 +342,11 @@ class TraceTestCase(unittest.TestCase):
         :param events: the events to check (or `None` to check all in trace)
         :param check_order: whether to check that the matching event comes after the initial event
         """
-        if events is None:
-            events = self._events
         if matching_event_name is not None:
+            # Uses the name index if checking all events
             events = self.get_events_with_name(matching_event_name, events)
+        elif events is None:
+            events = self._events
         field_value = self.get_field(initial_event, field_name)
 
         # Get events with that handle
@@ -348,10 +363,9 @@ class TraceTestCase(unittest.TestCase):
             # Check order
             # Since matching pairs might repeat, we need to check
             # that there is at least one match that comes after
-            matches_ordered = [e for e in matches if self.are_events_ordered([initial_event, e])]
-            self.assertGreaterEqual(
-                len(matches_ordered),
-                1,
+            initial_timestamp = get_event_timestamp(initial_event)
+            self.assertTrue(
+                any(get_event_timestamp(e) > initial_timestamp for e in matches),
                 'matching field event not after initial event')
 
     def assertFieldEquals(  # noqa: N802
@@ -384,13 +398,11 @@ class TraceTestCase(unittest.TestCase):
         :param field_name: the field name
         :return: the value
         """
-        try:
-            value = get_field(event, field_name, default=None, raise_if_not_found=True)
-        except AttributeError as e:
+        value = get_field(event, field_name, default=None, raise_if_not_found=False)
+        if value is None:
             # Explicitly failing here
-            self.fail(str(e))
-        else:
-            return value
+            self.fail(f"event field '{field_name}' not found for event: {event}")
+        return value
 
     def get_procname(
         self,
@@ -417,8 +429,32 @@ class TraceTestCase(unittest.TestCase):
         :return: the list of events with the given name
         """
         if events is None:
-            events = self._events
-        return [e for e in events if get_event_name(e) == event_name]
+            return list(self._events_by_name.get(event_name, []))
+        get_name = get_event_name
+        return [e for e in events if get_name(e) == event_name]
+
+    def get_events_by_names(
+        self,
+        event_names: List[str],
+        events: Optional[List[DictEvent]] = None,
+    ) -> Dict[str, List[DictEvent]]:
+        """
+        Get all events with the given names, grouped by name.
+
+        The events are only traversed once, regardless of the number of names.
+
+        :param event_names: the event names
+        :param events: the events to check (or `None` to check all events)
+        :return: the lists of events with each given name, indexed by event name
+        """
+        if events is None:
+            return {name: list(self._events_by_name.get(name, [])) for name in event_names}
+        events_by_name: Dict[str, List[DictEvent]] = {name: [] for name in event_names}
+        for event in events:
+            matching_events = events_by_name.get(get_event_name(event))
+            if matching_events is not None:
+                matching_events.append(event)
+        return events_by_name
 
     def get_events_with_procname(
         self,
@@ -435,9 +471,11 @@ class TraceTestCase(unittest.TestCase):
         :param events: the events to check (or `None` to check all events)
         :return: the events with the given procname
         """
+        procname_trimmed = procname[:15]
         if events is None:
-            events = self._events
-        return [e for e in events if self.get_procname(e) == procname[:15]]
+            return list(self._events_by_procname.get(procname_trimmed, []))
+        get_event_procname = self.get_procname
+        return [e for e in events if get_event_procname(e) == procname_trimmed]
 
     def get_events_with_field_value(
         self,
@@ -457,7 +495,8 @@ class TraceTestCase(unittest.TestCase):
             field_values = [field_values]
         if events is None:
             events = self._events
-        return [e for e in events if get_field(e, field_name, None) in field_values]
+        get_event_field = get_field
+        return [e for e in events if get_event_field(e, field_name, None) in field_values]
 
     def get_events_with_field_not_value(
         self,
@@ -477,7 +516,8 @@ class TraceTestCase(unittest.TestCase):
             field_values = [field_values]
         if events is None:
             events = self._events
-        return [e for e in events if get_field(e, field_name, None) not in field_values]
+        get_event_field = get_field
+        return [e for e in events if get_event_field(e, field_name, None) not in field_values]
 
     def are_events_ordered(
         self,
@@ -488,8 +528,5 @@ class TraceTestCase(unittest.TestCase):
 
         :param events: the events in the expected order
         """
-        orders = [
-            get_event_timestamp(events[i]) < get_event_timestamp(events[i + 1])
-            for i in range(len(events) - 1)
-        ]
-        return all(orders)
+        timestamps = list(map(get_event_timestamp, events))
+        return all(map(operator.lt, timestamps, timestamps[1:]))
@@ -14,22 +14,26 @@
 
 """Utils for tracetools_test that are not strictly test-related."""
 
+import itertools
 import os
 import shutil
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
 from launch import Action
 from launch import LaunchDescription
 from launch import LaunchService
-from launch_ros.actions import Node
-from tracetools_launch.action import Trace
 from tracetools_read import DictEvent
 from tracetools_read import get_event_name
 from tracetools_trace.tools.path import append_timestamp
 
 
+# Makes session names unique even if they are created within the same second
+_session_name_counter = itertools.count()
+
+
 def run_and_trace(
     base_path: str,
     session_name_prefix: str,
@@ -38,7 +42,7 @@ def run_and_trace(
     package_name: str,
     node_names: List[str],
     additional_actions: Union[List[Action], Action] = [],
-) -> Tuple[int, str]:
+) -> Tuple[int, Optional[str]]:
     """
     Run a node while tracing.
 
@@ -49,32 +53,40 @@ def run_and_trace(
     :param package_name: the name of the package to use
     :param node_names: the names of the nodes to execute
     :param additional_actions: the list of additional actions to prepend
-    :return: exit code, full generated path
+    :return: exit code, full generated path (or `None` if there are no events to trace)
     """
-    session_name = append_timestamp(session_name_prefix)
-    full_path = os.path.join(base_path, session_name)
+    # Imported here since these pull in rclpy and the LTTng Python bindings,
+    # which the other functions in this module do not need
+    from launch_ros.actions import Node
+    from tracetools_launch.action import Trace
+
     if not isinstance(additional_actions, list):
         additional_actions = [additional_actions]
 
     launch_actions = additional_actions
-    # Add trace action
-    launch_actions.append(
-        Trace(
-            session_name=session_name,
-            append_timestamp=False,
-            base_path=base_path,
-            events_ust=ros_events,
-            events_kernel=kernel_events,
+    # Add trace action, unless there is nothing to trace
+    full_path: Optional[str] = None
+    if ros_events or kernel_events:
+        session_name = f'{append_timestamp(session_name_prefix)}-{next(_session_name_counter)}'
+        full_path = os.path.join(base_path, session_name)
+        launch_actions.append(
+            Trace(
+                session_name=session_name,
+                append_timestamp=False,
+                base_path=base_path,
+                events_ust=ros_events,
+                events_kernel=kernel_events,
+            )
         )
-    )
     # Add nodes
-    for node_name in node_names:
-        n = Node(
+    launch_actions.extend(
+        Node(
             package=package_name,
             executable=node_name,
             output='screen',
         )
-        launch_actions.append(n)
+        for node_name in node_names
+    )
     ld = LaunchDescription(launch_actions)
     ls = LaunchService()
     ls.include_launch_description(ld)
@@ -84,12 +96,14 @@ def run_and_trace(
     return exit_code, full_path
 
 
-def cleanup_trace(full_path: str) -> None:
+def cleanup_trace(full_path: Optional[str]) -> None:
     """
     Cleanup trace data.
 
-    :param full_path: the full path to the main trace directory
+    :param full_path: the full path to the main trace directory (or `None` if there is none)
     """
+    if not full_path or not os.path.isdir(full_path):
+        return
     shutil.rmtree(full_path)
 
 
@@ -100,4 +114,4 @@ def get_event_names(events: List[DictEvent]) -> List[str]:
     :param events: the events of the trace
     :return: the list of event names
     """
-    return [get_event_name(e) for e in events]
+    return list(map(get_event_name, events))